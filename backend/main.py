@@ -1,25 +1,119 @@
 import asyncio
-import json
+import functools
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Optional
 
+import orjson
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.websockets import WebSocketState
+from vosk import Model
 
+from .pipeline.codec import OpusChunkEncoder, opus_available
 from .pipeline.conversation import ConversationManager
-from .pipeline.recognizer import StreamingRecognizer
+from .pipeline.recognizer import StreamingRecognizer, load_vosk_model
 from .pipeline.tts import SpeechSynthesizer
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+# Control frames carry no payload, so they are serialized once up front.
+_PONG_FRAME = '{"type":"pong"}'
+_CLEAR_AUDIO_QUEUE_FRAME = '{"type":"clear_audio_queue"}'
+_SESSION_RESET_FRAME = '{"type":"session_reset"}'
 
-def create_app() -> FastAPI:
-    app = FastAPI(title="Voice Conversation")
+_PARTIAL_TRANSCRIPT_PREFIX = '{"type":"partial_transcript","text":'
+_FINAL_TRANSCRIPT_PREFIX = '{"type":"final_transcript","text":'
+_ASSISTANT_TEXT_PREFIX = '{"type":"assistant_text","text":'
+
+# Path of the VITS ONNX export; when set, synthesis runs the int8 ONNX Runtime graph.
+TTS_ONNX_PATH_ENV = "VOICECONV_TTS_ONNX_PATH"
+
+# One synthesis runs at a time per model; the second worker holds the next sentence.
+TTS_POOL_WORKERS = 2
+
+# Partial hypotheses are coalesced so at most one frame goes out per interval.
+PARTIAL_FLUSH_INTERVAL = 0.1
+
+
+def _text_frame(prefix: str, text: str) -> str:
+    """Complete a frame template so only the text payload is escaped per send."""
+
+    return prefix + orjson.dumps(text).decode() + "}"
+
+
+class ModelRegistry:
+    """Heavy models shared by every WebSocket session in the process.
+
+    Models are loaded on the first connection rather than at import time.
+    Vosk supports many recognizers over one ``Model``, so each session only
+    creates its own lightweight ``KaldiRecognizer``.
+    """
+
+    def __init__(self, tts_onnx_path: Optional[Path] = None) -> None:
+        self.tts_onnx_path = tts_onnx_path
+        # Vosk and Coqui release the GIL inside native code, so dedicated pools let
+        # sessions recognise and synthesize concurrently without starving the loop.
+        # The cores are split rather than shared: half go to the TTS model's own
+        # intra-op threads, and the rest to Vosk decodes, which are single-threaded
+        # each. Synthesis is serialized per model, so its pool only needs enough
+        # workers to keep the next sentence queued behind the running one.
+        cores = os.cpu_count() or 1
+        self.tts_threads = max(1, cores // 2)
+        stt_workers = max(1, cores - self.tts_threads)
+        self.stt_executor = ThreadPoolExecutor(max_workers=stt_workers, thread_name_prefix="stt")
+        self.tts_executor = ThreadPoolExecutor(
+            max_workers=TTS_POOL_WORKERS, thread_name_prefix="tts"
+        )
+        self.conversation_manager = ConversationManager()
+        self.stt_model: Optional[Model] = None
+        self.synthesizer: Optional[SpeechSynthesizer] = None
+        self._load_lock = asyncio.Lock()
+
+    async def load(self) -> None:
+        if self.synthesizer is not None:
+            return
+
+        async with self._load_lock:
+            if self.synthesizer is not None:
+                return
+            loop = asyncio.get_running_loop()
+            stt_model = await loop.run_in_executor(self.stt_executor, load_vosk_model)
+            synthesizer = await loop.run_in_executor(
+                self.tts_executor,
+                functools.partial(
+                    SpeechSynthesizer,
+                    executor=self.tts_executor,
+                    num_threads=self.tts_threads,
+                    onnx_model_path=self.tts_onnx_path,
+                ),
+            )
+            self.stt_model, self.synthesizer = stt_model, synthesizer
+
+    def shutdown(self) -> None:
+        self.stt_executor.shutdown(wait=False, cancel_futures=True)
+        self.tts_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def create_app(tts_onnx_path: Optional[Path] = None) -> FastAPI:
+    if tts_onnx_path is None and os.environ.get(TTS_ONNX_PATH_ENV):
+        tts_onnx_path = Path(os.environ[TTS_ONNX_PATH_ENV])
+    registry = ModelRegistry(tts_onnx_path=tts_onnx_path)
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        try:
+            yield
+        finally:
+            registry.shutdown()
+
+    app = FastAPI(title="Voice Conversation", lifespan=lifespan)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -36,15 +130,35 @@ def create_app() -> FastAPI:
         async def serve_index() -> FileResponse:
             return FileResponse(static_dir / "index.html")
 
-    synthesizer = SpeechSynthesizer()
-    conversation_manager = ConversationManager()
-
     @app.websocket("/ws")
     async def websocket_endpoint(websocket: WebSocket) -> None:
         await websocket.accept()
-        recognizer = StreamingRecognizer()
+        loop = asyncio.get_running_loop()
+        await registry.load()
+        synthesizer = registry.synthesizer
+        conversation_manager = registry.conversation_manager
+        recognizer = StreamingRecognizer(model=registry.stt_model)
         tts_task: Optional[asyncio.Task] = None
         playback_lock = asyncio.Lock()
+        pending_partial: Optional[str] = None
+        audio_encoder: Optional[OpusChunkEncoder] = None
+
+        async def flush_partials() -> None:
+            nonlocal pending_partial
+            while True:
+                await asyncio.sleep(PARTIAL_FLUSH_INTERVAL)
+                if pending_partial is None:
+                    continue
+                text, pending_partial = pending_partial, None
+                try:
+                    await websocket.send_text(_text_frame(_PARTIAL_TRANSCRIPT_PREFIX, text))
+                except (RuntimeError, WebSocketDisconnect):
+                    return
+                except Exception:
+                    logger.debug("Failed to send partial transcript", exc_info=True)
+                    return
+
+        partial_task = asyncio.create_task(flush_partials())
 
         async def cancel_tts() -> None:
             nonlocal tts_task
@@ -58,7 +172,7 @@ def create_app() -> FastAPI:
             tts_task = None
             if websocket.client_state == WebSocketState.CONNECTED:
                 try:
-                    await websocket.send_text(json.dumps({"type": "clear_audio_queue"}))
+                    await websocket.send_text(_CLEAR_AUDIO_QUEUE_FRAME)
                 except (RuntimeError, WebSocketDisconnect):
                     pass
                 except Exception:
@@ -71,18 +185,34 @@ def create_app() -> FastAPI:
                     raise WebSocketDisconnect(message.get("code", 1000))
 
                 if "text" in message and message["text"] is not None:
-                    payload = json.loads(message["text"])
+                    payload = orjson.loads(message["text"])
                     msg_type = payload.get("type")
 
                     if msg_type == "ping":
-                        await websocket.send_text(json.dumps({"type": "pong"}))
+                        await websocket.send_text(_PONG_FRAME)
+                        continue
+
+                    if msg_type == "hello":
+                        # Clients that can decode Opus get it; everyone else keeps raw PCM16.
+                        codecs = payload.get("codecs") or []
+                        if "opus" in codecs and opus_available():
+                            audio_encoder = OpusChunkEncoder(synthesizer.target_sample_rate)
+                        else:
+                            audio_encoder = None
+                        audio_format = {
+                            "type": "audio_format",
+                            "codec": "opus" if audio_encoder else "pcm16",
+                            "sample_rate": synthesizer.target_sample_rate,
+                        }
+                        await websocket.send_text(orjson.dumps(audio_format).decode())
                         continue
 
                     if msg_type == "stop" or msg_type == "reset":
+                        pending_partial = None
                         recognizer.reset()
                         conversation_manager.reset()
                         await cancel_tts()
-                        await websocket.send_text(json.dumps({"type": "session_reset"}))
+                        await websocket.send_text(_SESSION_RESET_FRAME)
                         continue
 
                     continue
@@ -91,24 +221,22 @@ def create_app() -> FastAPI:
                 if data is None:
                     continue
 
-                final_result, partial = recognizer.accept_audio(data)
+                final_result, partial = await loop.run_in_executor(
+                    registry.stt_executor, recognizer.accept_audio, data
+                )
                 if partial:
-                    await websocket.send_text(
-                        json.dumps({"type": "partial_transcript", "text": partial})
-                    )
+                    pending_partial = partial
 
                 if final_result:
+                    pending_partial = None
                     await cancel_tts()
-                    await websocket.send_text(
-                        json.dumps({"type": "final_transcript", "text": final_result})
-                    )
+                    await websocket.send_text(_text_frame(_FINAL_TRANSCRIPT_PREFIX, final_result))
                     response_text = conversation_manager.generate_response(final_result)
-                    await websocket.send_text(
-                        json.dumps({"type": "assistant_text", "text": response_text})
-                    )
+                    await websocket.send_text(_text_frame(_ASSISTANT_TEXT_PREFIX, response_text))
 
                     async def stream_tts() -> None:
-                        async for chunk in synthesizer.stream_speech(response_text):
+                        speech = synthesizer.stream_speech(response_text, audio_encoder)
+                        async for chunk in speech:
                             async with playback_lock:
                                 await websocket.send_bytes(chunk)
 
@@ -118,6 +246,10 @@ def create_app() -> FastAPI:
         except Exception:
             logger.exception("Unexpected error in websocket session")
         finally:
+            partial_task.cancel()
+            # Whatever ended the flush task, the TTS cleanup below must still run.
+            with suppress(asyncio.CancelledError, Exception):
+                await partial_task
             await cancel_tts()
             recognizer.close()
 
@@ -0,0 +1,67 @@
+import struct
+from functools import lru_cache
+
+import numpy as np
+
+OPUS_FRAME_MS = 20
+OPUS_BITRATE = 32000
+
+_EMPTY = np.zeros(0, dtype=np.int16)
+
+
+@lru_cache(maxsize=1)
+def opus_available() -> bool:
+    """Whether opuslib and the native libopus it wraps can be loaded."""
+
+    try:
+        import opuslib  # noqa: F401
+    except Exception:
+        return False
+    return True
+
+
+class OpusChunkEncoder:
+    """Encodes 16-bit mono PCM chunks into length-prefixed Opus packets.
+
+    Opus only accepts fixed-size frames, so samples that do not fill a 20 ms
+    frame are carried over to the next call. Each returned payload is a run of
+    ``<uint16 little-endian length><packet>`` records that the browser splits
+    back into individual packets for its decoder.
+    """
+
+    def __init__(self, sample_rate: int = 16000, bitrate: int = OPUS_BITRATE) -> None:
+        import opuslib
+
+        self.sample_rate = sample_rate
+        self.frame_size = sample_rate * OPUS_FRAME_MS // 1000
+        self._encoder = opuslib.Encoder(sample_rate, 1, opuslib.APPLICATION_VOIP)
+        self._encoder.bitrate = bitrate
+        self._pending = _EMPTY
+
+    def encode(self, pcm16: np.ndarray) -> bytes:
+        samples = np.concatenate((self._pending, pcm16)) if len(self._pending) else pcm16
+        usable = len(samples) - len(samples) % self.frame_size
+        self._pending = samples[usable:].copy()
+        return self._encode_frames(samples[:usable])
+
+    def flush(self) -> bytes:
+        """Encode any carried-over samples, zero-padded to a full frame."""
+
+        if not len(self._pending):
+            return b""
+        frame = np.zeros(self.frame_size, dtype=np.int16)
+        frame[: len(self._pending)] = self._pending
+        self._pending = _EMPTY
+        return self._encode_frames(frame)
+
+    def reset(self) -> None:
+        self._pending = _EMPTY
+
+    def _encode_frames(self, samples: np.ndarray) -> bytes:
+        payload = bytearray()
+        for start in range(0, len(samples), self.frame_size):
+            frame = samples[start : start + self.frame_size]
+            packet = self._encoder.encode(frame.tobytes(), self.frame_size)
+            payload += struct.pack("<H", len(packet))
+            payload += packet
+        return bytes(payload)
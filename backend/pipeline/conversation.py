@@ -1,15 +1,21 @@
 from __future__ import annotations
 
 import datetime as dt
+import re
+import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List
+from typing import Deque
+
+_GREETINGS = frozenset({"hello", "hi", "hey"})
+_KEYWORD_PATTERN = re.compile(r"\b(hello|hi|hey|time|your name)\b")
 
 
 @dataclass
 class Utterance:
     role: str
     text: str
-    timestamp: dt.datetime = field(default_factory=lambda: dt.datetime.utcnow())
+    timestamp: int = field(default_factory=time.monotonic_ns)
 
 
 class ConversationManager:
@@ -17,7 +23,8 @@ class ConversationManager:
 
     def __init__(self, max_history: int = 6) -> None:
         self.max_history = max_history
-        self.history: List[Utterance] = []
+        # A bounded deque drops the oldest turn in O(1) as new ones arrive.
+        self.history: Deque[Utterance] = deque(maxlen=max_history)
 
     def reset(self) -> None:
         self.history.clear()
@@ -35,8 +42,6 @@ class ConversationManager:
 
     def _append(self, role: str, text: str) -> None:
         self.history.append(Utterance(role=role, text=text))
-        if len(self.history) > self.max_history:
-            self.history = self.history[-self.max_history :]
 
     def _build_response(self, user_text: str) -> str:
         """A deterministic fallback response generator.
@@ -44,14 +49,16 @@ class ConversationManager:
         This avoids relying on external LLM APIs so the pipeline can run offline.
         """
 
-        if any(g in user_text.lower() for g in ["hello", "hi", "hey"]):
+        keywords = set(_KEYWORD_PATTERN.findall(user_text.lower()))
+
+        if keywords & _GREETINGS:
             return "Hello! How can I help you today?"
 
-        if "time" in user_text.lower():
+        if "time" in keywords:
             now = dt.datetime.now().strftime("%H:%M")
             return f"It's currently {now}. What else would you like to talk about?"
 
-        if "your name" in user_text.lower():
+        if "your name" in keywords:
             return "I'm an offline demo assistant built for streaming conversations."
 
         if user_text.endswith("?"):
@@ -1,5 +1,6 @@
 import json
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Tuple
 
@@ -7,38 +8,51 @@ from vosk import KaldiRecognizer, Model
 
 VOSK_MODEL_URL = "https://alphacephei.com/vosk/models/vosk-model-small-en-us-0.15.zip"
 VOSK_MODEL_DIR = Path(__file__).resolve().parent.parent / "models" / "vosk-model"
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+DOWNLOAD_PARTS = 4
 
 
 class StreamingRecognizer:
-    def __init__(self, sample_rate: int = 16000) -> None:
+    def __init__(self, sample_rate: int = 16000, model: Optional[Model] = None) -> None:
         self.sample_rate = sample_rate
-        self.model = self._load_model()
+        self.model = model if model is not None else load_vosk_model()
         self.recognizer = KaldiRecognizer(self.model, self.sample_rate)
         self.recognizer.SetWords(True)
+        self._last_partial_raw: Optional[str] = None
 
     def accept_audio(self, pcm_bytes: bytes) -> Tuple[Optional[str], Optional[str]]:
         """Feed audio to the recognizer.
 
-        Returns a tuple of (final_result, partial_result).
+        Returns a tuple of (final_result, partial_result). The partial result is
+        ``None`` when the hypothesis has not changed since the previous packet.
         """
 
         if self.recognizer.AcceptWaveform(pcm_bytes):
+            self._last_partial_raw = None
             result = json.loads(self.recognizer.Result())
             return result.get("text", ""), None
 
-        partial = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        # Vosk re-reports the same partial for most packets; skip the parse then.
+        raw_partial = self.recognizer.PartialResult()
+        if raw_partial == self._last_partial_raw:
+            return None, None
+        self._last_partial_raw = raw_partial
+
+        partial = json.loads(raw_partial).get("partial", "")
         return None, partial
 
     def reset(self) -> None:
         self.recognizer = KaldiRecognizer(self.model, self.sample_rate)
         self.recognizer.SetWords(True)
+        self._last_partial_raw = None
 
     def close(self) -> None:
         pass
 
-    def _load_model(self) -> Model:
-        model_path = ensure_vosk_model()
-        return Model(str(model_path))
+
+def load_vosk_model() -> Model:
+    model_path = ensure_vosk_model()
+    return Model(str(model_path))
 
 
 def ensure_vosk_model() -> Path:
@@ -60,15 +74,88 @@ def ensure_vosk_model() -> Path:
     return VOSK_MODEL_DIR
 
 
-def download_file(url: str, destination: Path) -> None:
+def download_file(url: str, destination: Path, parts: int = DOWNLOAD_PARTS) -> None:
+    """Download ``url`` to ``destination``, fetching byte ranges in parallel.
+
+    Falls back to a single streamed request when the server rejects the HEAD
+    probe, omits ``Content-Length`` or does not advertise range support. Data
+    is written to a ``.part`` file first so an interrupted download is never
+    mistaken for a complete one.
+    """
+
     import requests
 
     if destination.exists():
         return
 
-    response = requests.get(url, stream=True, timeout=60)
-    response.raise_for_status()
+    partial_path = destination.with_name(destination.name + ".part")
+    try:
+        head = requests.head(url, allow_redirects=True, timeout=60)
+        head.raise_for_status()
+        total = int(head.headers.get("Content-Length", 0))
+        accepts_ranges = head.headers.get("Accept-Ranges", "").lower() == "bytes"
+        range_url = head.url
+    except (requests.RequestException, ValueError):
+        # Some servers and proxies refuse HEAD; a plain GET still works there.
+        total, accepts_ranges, range_url = 0, False, url
+
+    if accepts_ranges and total > 0 and parts > 1:
+        try:
+            _download_ranges(range_url, partial_path, total, parts)
+        except _RangeNotSupported:
+            _download_sequential(url, partial_path)
+    else:
+        _download_sequential(url, partial_path)
+
+    partial_path.replace(destination)
+
+
+class _RangeNotSupported(Exception):
+    pass
+
+
+def _download_sequential(url: str, destination: Path) -> None:
+    import requests
+
+    with requests.get(url, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        with open(destination, "wb") as f:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                if chunk:
+                    f.write(chunk)
+
+
+def _download_ranges(url: str, destination: Path, total: int, parts: int) -> None:
     with open(destination, "wb") as f:
-        for chunk in response.iter_content(chunk_size=8192):
-            if chunk:
-                f.write(chunk)
+        f.truncate(total)
+
+    part_size = -(-total // parts)
+    ranges = [(start, min(start + part_size, total) - 1) for start in range(0, total, part_size)]
+    with ThreadPoolExecutor(max_workers=len(ranges), thread_name_prefix="download") as pool:
+        list(pool.map(lambda r: _download_range(url, destination, *r), ranges))
+
+
+def _download_range(url: str, destination: Path, start: int, end: int) -> None:
+    import requests
+
+    headers = {"Range": f"bytes={start}-{end}"}
+    with requests.get(url, headers=headers, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise _RangeNotSupported
+
+        # Each worker owns a disjoint slice of the preallocated file.
+        received = 0
+        with open(destination, "r+b") as f:
+            f.seek(start)
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                if chunk:
+                    f.write(chunk)
+                    received += len(chunk)
+
+    # A short body would otherwise leave a zero-filled hole in the file.
+    expected = end - start + 1
+    if received != expected:
+        raise RuntimeError(
+            f"Range {start}-{end} of {url} returned {received} bytes, expected {expected}"
+        )
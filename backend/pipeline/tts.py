@@ -1,10 +1,59 @@
 import asyncio
-from typing import AsyncGenerator, Optional, Tuple
+import os
+import threading
+from collections import deque
+from concurrent.futures import Executor
+from functools import lru_cache
+from math import gcd
+from pathlib import Path
+from typing import Any, AsyncGenerator, Deque, Optional, Tuple
 
 import numpy as np
-from scipy.signal import resample_poly
+import pysbd
+import torch
+from scipy.signal import firwin, resample_poly
 from TTS.api import TTS
 
+from .codec import OpusChunkEncoder
+
+_INT16_SCALE = 32767.0
+
+# Tried in order; whichever the installed onnxruntime build supports is used.
+_ONNX_PROVIDERS = (
+    "CUDAExecutionProvider",
+    "CoreMLExecutionProvider",
+    "DmlExecutionProvider",
+    "CPUExecutionProvider",
+)
+
+# Silence Coqui's Synthesizer.tts appends after every sentence it synthesizes.
+_SENTENCE_PAUSE_SAMPLES = 10000
+
+# Below this size a pooled buffer saves less than the bookkeeping costs.
+_MIN_POOLED_CHUNK_BYTES = 1280
+
+
+class Int16BufferPool:
+    """A small bounded free list of PCM16 byte buffers.
+
+    Only touched from the event loop thread, so it needs no locking.
+    """
+
+    def __init__(self, max_size: int = 4) -> None:
+        self.max_size = max_size
+        self._free: Deque[bytearray] = deque()
+
+    def acquire(self, nbytes: int) -> bytearray:
+        while self._free:
+            buf = self._free.pop()
+            if len(buf) == nbytes:
+                return buf
+        return bytearray(nbytes)
+
+    def release(self, buf: bytearray) -> None:
+        if len(self._free) < self.max_size:
+            self._free.append(buf)
+
 
 class SpeechSynthesizer:
     def __init__(
@@ -12,9 +61,31 @@ class SpeechSynthesizer:
         target_sample_rate: int = 16000,
         model_name: str = "tts_models/en/ljspeech/vits",
         speaker: Optional[str] = None,
+        max_pending_sentences: int = 2,
+        executor: Optional[Executor] = None,
+        onnx_model_path: Optional[Path] = None,
+        use_gpu: Optional[bool] = None,
+        num_threads: Optional[int] = None,
     ) -> None:
         self.target_sample_rate = target_sample_rate
-        self._tts = TTS(model_name, progress_bar=False, gpu=False)
+        self._executor = executor
+        self.max_pending_sentences = max(1, max_pending_sentences)
+        if use_gpu is None:
+            use_gpu = torch.cuda.is_available()
+        # The ONNX path picks its own execution provider; export needs the CPU model.
+        self._use_cuda = use_gpu and onnx_model_path is None
+        self._num_threads = num_threads or max(1, (os.cpu_count() or 2) // 2)
+        if num_threads is not None:
+            # Process-wide: caps torch's intra-op pool so synthesis leaves cores
+            # free for speech recognition.
+            torch.set_num_threads(num_threads)
+        self._tts = TTS(model_name, progress_bar=False, gpu=self._use_cuda)
+        # Coqui's Synthesizer keeps per-call state on shared objects (its pysbd
+        # segmenter among them), so only one thread may run it at a time. The
+        # ONNX path takes the same lock so synthesis stays within num_threads.
+        self._tts_lock = threading.Lock()
+        self._segmenter = pysbd.Segmenter(language="en", clean=False)
+        self._buffer_pool = Int16BufferPool()
 
         if speaker is None:
             available_speakers = getattr(self._tts, "speakers", None) or []
@@ -22,29 +93,186 @@ class SpeechSynthesizer:
 
         self._speaker = speaker
 
-    async def stream_speech(self, text: str) -> AsyncGenerator[bytes, None]:
-        if not text.strip():
+        self._onnx_session: Any = None
+        self._onnx_speaker_id: Optional[int] = None
+        if onnx_model_path is not None:
+            self._onnx_session = self._load_onnx_session(Path(onnx_model_path))
+
+    async def stream_speech(
+        self, text: str, encoder: Optional[OpusChunkEncoder] = None
+    ) -> AsyncGenerator[bytes, None]:
+        """Yield 16 kHz PCM16 chunks, synthesizing the text sentence by sentence.
+
+        Up to ``max_pending_sentences`` sentences are queued ahead of the one
+        being streamed, so the next sentence is synthesized while the current
+        one plays and playback starts after the first sentence rather than
+        after the whole response. Full-size chunks are yielded from a
+        buffer pool, so a chunk is only valid until the generator is resumed.
+        With an ``encoder`` the chunks are Opus packets instead of raw PCM.
+        """
+
+        sentences = [s.strip() for s in self._segmenter.segment(text) if s.strip()]
+        if not sentences:
             return
 
         loop = asyncio.get_running_loop()
-        waveform, sample_rate = await loop.run_in_executor(None, self._synthesize, text)
-        pcm16 = self._to_int16(waveform, sample_rate)
+        remaining = iter(sentences)
+        pending: Deque["asyncio.Future[Tuple[np.ndarray, int]]"] = deque()
         chunk_size = self.target_sample_rate // 4  # 250ms chunks
+        chunk_bytes = chunk_size * 2
+        pooled = chunk_bytes >= _MIN_POOLED_CHUNK_BYTES
+
+        def schedule_next() -> None:
+            sentence = next(remaining, None)
+            if sentence is not None:
+                pending.append(loop.run_in_executor(self._executor, self._synthesize, sentence))
+
+        if encoder is not None:
+            encoder.reset()
+
+        try:
+            for _ in range(self.max_pending_sentences):
+                schedule_next()
+
+            while pending:
+                waveform, sample_rate = await pending.popleft()
+                schedule_next()
+                pcm16 = self._to_int16(waveform, sample_rate)
+
+                for start in range(0, len(pcm16), chunk_size):
+                    end = min(start + chunk_size, len(pcm16))
+                    chunk = pcm16[start:end]
+                    await asyncio.sleep(0)
+                    if encoder is not None:
+                        payload = encoder.encode(chunk)
+                        if payload:
+                            yield payload
+                        continue
 
-        for start in range(0, len(pcm16), chunk_size):
-            end = min(start + chunk_size, len(pcm16))
-            chunk = pcm16[start:end]
-            await asyncio.sleep(0)
-            yield chunk.tobytes()
+                    if not pooled or len(chunk) != chunk_size:
+                        yield chunk.tobytes()
+                        continue
+
+                    buf = self._buffer_pool.acquire(chunk_bytes)
+                    np.frombuffer(buf, dtype=np.int16)[:] = chunk
+                    try:
+                        yield buf
+                    finally:
+                        self._buffer_pool.release(buf)
+
+            if encoder is not None:
+                tail = encoder.flush()
+                if tail:
+                    yield tail
+        finally:
+            for future in pending:
+                future.cancel()
 
     def _synthesize(self, text: str) -> Tuple[np.ndarray, int]:
         kwargs = {"speaker": self._speaker} if self._speaker else {}
-        wav = self._tts.tts(text, **kwargs)
+        with self._tts_lock:
+            if self._onnx_session is not None:
+                return self._synthesize_onnx(text)
+            wav = self._tts.tts(text, **kwargs)
         sample_rate = self._tts.synthesizer.output_sample_rate
         return wav, sample_rate
 
+    def _synthesize_onnx(self, text: str) -> Tuple[np.ndarray, int]:
+        """Run one sentence through the ONNX graph, post-processed like Coqui.
+
+        ``Synthesizer.tts`` trims trailing silence when the model config asks
+        for it and appends a fixed pause after every sentence; doing the same
+        here keeps the two backends interchangeable.
+        """
+
+        from TTS.tts.utils.synthesis import trim_silence
+
+        synthesizer = self._tts.synthesizer
+        model = synthesizer.tts_model
+        token_ids = np.asarray(model.tokenizer.text_to_ids(text), dtype=np.int64)[None, :]
+        inputs = {
+            "input": token_ids,
+            "input_lengths": np.array([token_ids.shape[1]], dtype=np.int64),
+            "scales": np.array(
+                [model.inference_noise_scale, model.length_scale, model.inference_noise_scale_dp],
+                dtype=np.float32,
+            ),
+        }
+        if self._onnx_speaker_id is not None:
+            inputs["sid"] = np.array([self._onnx_speaker_id], dtype=np.int64)
+
+        waveform = self._onnx_session.run(["output"], inputs)[0].reshape(-1)
+        audio_config = synthesizer.tts_config.audio
+        if "do_trim_silence" in audio_config and audio_config["do_trim_silence"]:
+            waveform = trim_silence(waveform, model.ap)
+        pause = np.zeros(_SENTENCE_PAUSE_SAMPLES, dtype=waveform.dtype)
+        return np.concatenate((waveform, pause)), synthesizer.output_sample_rate
+
+    def _load_onnx_session(self, model_path: Path) -> Any:
+        """Export the VITS model to ONNX once, quantize it to int8 and load it.
+
+        The exported and quantized graphs are cached next to ``model_path`` so
+        the export only happens on first use.
+        """
+
+        import onnxruntime as ort
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        model = self._tts.synthesizer.tts_model
+        if not hasattr(model, "export_onnx"):
+            raise ValueError(f"{type(model).__name__} does not support ONNX export")
+
+        quantized_path = model_path.with_suffix(".int8.onnx")
+        if not quantized_path.exists():
+            if not model_path.exists():
+                model_path.parent.mkdir(parents=True, exist_ok=True)
+                model.export_onnx(output_path=str(model_path), verbose=False)
+            quantize_dynamic(str(model_path), str(quantized_path), weight_type=QuantType.QInt8)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = self._num_threads
+        available = set(ort.get_available_providers())
+        providers = [p for p in _ONNX_PROVIDERS if p in available]
+        session = ort.InferenceSession(
+            str(quantized_path), sess_options=options, providers=providers
+        )
+
+        if any(i.name == "sid" for i in session.get_inputs()):
+            speaker_ids = model.speaker_manager.name_to_id
+            self._onnx_speaker_id = speaker_ids[self._speaker] if self._speaker else 0
+        return session
+
     def _to_int16(self, waveform: np.ndarray, sample_rate: int) -> np.ndarray:
+        waveform = np.asarray(waveform, dtype=np.float32)
         if sample_rate != self.target_sample_rate:
-            waveform = resample_poly(waveform, self.target_sample_rate, sample_rate)
-        waveform = np.clip(waveform, -1.0, 1.0)
-        return (waveform * 32767).astype(np.int16)
+            # The int16 gain is folded into the filter taps, so resampling and
+            # scaling happen in the same pass over the waveform.
+            waveform = resample_poly(
+                waveform,
+                self.target_sample_rate,
+                sample_rate,
+                window=_resample_filter(self.target_sample_rate, sample_rate),
+            )
+        else:
+            waveform = np.multiply(waveform, _INT16_SCALE)
+
+        np.clip(waveform, -_INT16_SCALE, _INT16_SCALE, out=waveform)
+        return waveform.astype(np.int16)
+
+
+@lru_cache(maxsize=8)
+def _resample_filter(up: int, down: int) -> np.ndarray:
+    """Anti-aliasing FIR taps matching ``resample_poly``'s default design.
+
+    The VITS output rate never changes at runtime, so designing the Kaiser
+    filter once per rate pair saves rebuilding ~9k taps on every response.
+    The taps are pre-scaled to int16 full scale. ``resample_poly`` copies the
+    array before applying its own gain, so sharing the cached taps is safe.
+    """
+
+    factor = gcd(up, down)
+    max_rate = max(up, down) // factor
+    half_len = 10 * max_rate
+    taps = firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0))
+    return (taps * _INT16_SCALE).astype(np.float32)
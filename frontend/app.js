@@ -15,6 +15,8 @@ let player = null;
 const WS_ENDPOINT = `${window.location.protocol === 'https:' ? 'wss' : 'ws'}://${window.location.host}/ws`;
 const CLIENT_SAMPLE_RATE = 48000;
 const TARGET_SAMPLE_RATE = 16000;
+const OPUS_FRAME_US = 20000;
+const OPUS_DECODER_CONFIG = { codec: 'opus', sampleRate: TARGET_SAMPLE_RATE, numberOfChannels: 1 };
 
 startBtn.addEventListener('click', startConversation);
 stopBtn.addEventListener('click', stopConversation);
@@ -62,12 +64,33 @@ async function startConversation() {
   }
 }
 
-function onSocketOpen() {
+async function onSocketOpen() {
   setStatus('Connected');
   startBtn.disabled = true;
   stopBtn.disabled = false;
 
   setupMediaProcessing();
+
+  const codecs = await supportedPlaybackCodecs();
+  if (ws && ws.readyState === WebSocket.OPEN) {
+    ws.send(JSON.stringify({ type: 'hello', codecs }));
+  }
+}
+
+async function supportedPlaybackCodecs() {
+  const codecs = ['pcm16'];
+  if (typeof AudioDecoder === 'undefined') {
+    return codecs;
+  }
+  try {
+    const { supported } = await AudioDecoder.isConfigSupported(OPUS_DECODER_CONFIG);
+    if (supported) {
+      codecs.unshift('opus');
+    }
+  } catch (err) {
+    console.warn('Opus decoding unavailable, falling back to PCM', err);
+  }
+  return codecs;
 }
 
 function setupMediaProcessing() {
@@ -126,6 +149,11 @@ function handleControlMessage(message) {
     case 'session_reset':
       resetTranscript();
       break;
+    case 'audio_format':
+      if (player) {
+        player.setCodec(message.codec);
+      }
+      break;
     default:
       break;
   }
@@ -157,7 +185,7 @@ function stopConversation() {
   }
 
   if (player) {
-    player.reset();
+    player.close();
     player = null;
   }
 
@@ -225,12 +253,59 @@ class StreamingPlayer {
     this.sourceSampleRate = sourceSampleRate;
     this.playbackTime = context.currentTime;
     this.activeSources = new Set();
+    this.codec = 'pcm16';
+    this.decoder = null;
+    this.decoderTimestamp = 0;
+  }
+
+  setCodec(codec) {
+    this.codec = codec;
+    if (codec === 'opus' && !this.decoder) {
+      this.decoder = new AudioDecoder({
+        output: (audioData) => this._onDecoded(audioData),
+        error: (err) => console.error('Opus decoder error', err),
+      });
+      this.decoder.configure(OPUS_DECODER_CONFIG);
+    }
   }
 
   enqueue(arrayBuffer) {
+    if (this.codec === 'opus' && this.decoder) {
+      this._enqueueOpus(arrayBuffer);
+      return;
+    }
+
     const int16Data = new Int16Array(arrayBuffer);
     const floatData = this._upsample(int16Data, this.sourceSampleRate, this.context.sampleRate);
-    const buffer = this.context.createBuffer(1, floatData.length, this.context.sampleRate);
+    this._schedule(floatData, this.context.sampleRate);
+  }
+
+  _enqueueOpus(arrayBuffer) {
+    // Each message is a run of <uint16 LE length><opus packet> records.
+    const view = new DataView(arrayBuffer);
+    let offset = 0;
+    while (offset + 2 <= view.byteLength) {
+      const length = view.getUint16(offset, true);
+      offset += 2;
+      const packet = new Uint8Array(arrayBuffer, offset, length);
+      offset += length;
+      this.decoder.decode(
+        new EncodedAudioChunk({ type: 'key', timestamp: this.decoderTimestamp, data: packet })
+      );
+      this.decoderTimestamp += OPUS_FRAME_US;
+    }
+  }
+
+  _onDecoded(audioData) {
+    const floatData = new Float32Array(audioData.numberOfFrames);
+    audioData.copyTo(floatData, { planeIndex: 0, format: 'f32-planar' });
+    const { sampleRate } = audioData;
+    audioData.close();
+    this._schedule(floatData, sampleRate);
+  }
+
+  _schedule(floatData, sampleRate) {
+    const buffer = this.context.createBuffer(1, floatData.length, sampleRate);
     buffer.copyToChannel(floatData, 0, 0);
     const source = this.context.createBufferSource();
     source.buffer = buffer;
@@ -251,6 +326,11 @@ class StreamingPlayer {
   }
 
   reset() {
+    if (this.decoder && this.decoder.state === 'configured') {
+      // Drop packets still being decoded so they are not scheduled after a flush.
+      this.decoder.reset();
+      this.decoder.configure(OPUS_DECODER_CONFIG);
+    }
     this.playbackTime = this.context.currentTime;
     this.activeSources.forEach((source) => {
       try {
@@ -262,6 +342,14 @@ class StreamingPlayer {
     this.activeSources.clear();
   }
 
+  close() {
+    this.reset();
+    if (this.decoder && this.decoder.state !== 'closed') {
+      this.decoder.close();
+    }
+    this.decoder = null;
+  }
+
   _upsample(int16Data, inRate, outRate) {
     if (inRate === outRate) {
       const direct = new Float32Array(int16Data.length);
@@ -0,0 +1,67 @@
+import struct
+
+import numpy as np
+import pytest
+
+from backend.pipeline.codec import OpusChunkEncoder, opus_available
+
+pytestmark = pytest.mark.skipif(not opus_available(), reason="libopus is not installed")
+
+SAMPLE_RATE = 16000
+
+
+def _tone(num_samples: int) -> np.ndarray:
+    t = np.arange(num_samples) / SAMPLE_RATE
+    return (np.sin(2 * np.pi * 440 * t) * 8000).astype(np.int16)
+
+
+def _split_packets(payload: bytes) -> list:
+    """Parse the ``<uint16 LE length><packet>`` records the browser reads."""
+
+    packets = []
+    offset = 0
+    while offset < len(payload):
+        (length,) = struct.unpack_from("<H", payload, offset)
+        offset += 2
+        packets.append(payload[offset : offset + length])
+        offset += length
+    assert offset == len(payload)
+    return packets
+
+
+def test_encode_emits_whole_frames_and_carries_remainder():
+    encoder = OpusChunkEncoder(SAMPLE_RATE)
+
+    packets = _split_packets(encoder.encode(_tone(4000)))
+
+    assert encoder.frame_size == 320
+    assert len(packets) == 12
+    assert all(packets)
+    assert len(encoder._pending) == 160
+
+
+def test_flush_pads_carry_over_into_one_packet():
+    encoder = OpusChunkEncoder(SAMPLE_RATE)
+    encoder.encode(_tone(4000))
+
+    assert len(_split_packets(encoder.flush())) == 1
+    assert encoder.flush() == b""
+
+
+def test_carry_over_completes_the_next_frame():
+    encoder = OpusChunkEncoder(SAMPLE_RATE)
+    encoder.encode(_tone(4000))
+
+    packets = _split_packets(encoder.encode(_tone(160)))
+
+    assert len(packets) == 1
+    assert len(encoder._pending) == 0
+
+
+def test_reset_drops_carry_over():
+    encoder = OpusChunkEncoder(SAMPLE_RATE)
+    encoder.encode(_tone(4000))
+
+    encoder.reset()
+
+    assert encoder.flush() == b""
@@ -0,0 +1,127 @@
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend.pipeline.recognizer import download_file
+
+PAYLOAD = os.urandom(200_001)
+
+
+class ModelServer(ThreadingHTTPServer):
+    """Serves ``PAYLOAD`` with switchable HEAD and Range behaviour."""
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), ModelRequestHandler)
+        self.head_status = 200
+        self.send_content_length = True
+        self.honour_ranges = True
+        self.truncate_ranges = False
+        self.ranged_gets = 0
+        self.plain_gets = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}/vosk-model.zip"
+
+
+class ModelRequestHandler(BaseHTTPRequestHandler):
+    server: ModelServer
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_HEAD(self) -> None:
+        self.send_response(self.server.head_status)
+        if self.server.head_status == 200:
+            if self.server.send_content_length:
+                self.send_header("Content-Length", str(len(PAYLOAD)))
+            self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        match = re.fullmatch(r"bytes=(\d+)-(\d+)", self.headers.get("Range", ""))
+        if match and self.server.honour_ranges:
+            start, end = map(int, match.groups())
+            body = PAYLOAD[start : end + 1]
+            if self.server.truncate_ranges and start > 0:
+                body = body[:-10]
+            with self.server.lock:
+                self.server.ranged_gets += 1
+            self.send_response(206)
+        else:
+            body = PAYLOAD
+            if not match:
+                with self.server.lock:
+                    self.server.plain_gets += 1
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    srv = ModelServer()
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _assert_downloaded(destination) -> None:
+    assert destination.read_bytes() == PAYLOAD
+    assert not destination.with_name(destination.name + ".part").exists()
+
+
+def test_download_fetches_ranges_in_parallel(server, tmp_path):
+    destination = tmp_path / "vosk-model.zip"
+    download_file(server.url, destination, parts=4)
+
+    _assert_downloaded(destination)
+    assert server.ranged_gets == 4
+    assert server.plain_gets == 0
+
+
+def test_download_falls_back_when_head_is_rejected(server, tmp_path):
+    server.head_status = 405
+    destination = tmp_path / "vosk-model.zip"
+    download_file(server.url, destination)
+
+    _assert_downloaded(destination)
+    assert server.ranged_gets == 0
+    assert server.plain_gets == 1
+
+
+def test_download_falls_back_without_content_length(server, tmp_path):
+    server.send_content_length = False
+    destination = tmp_path / "vosk-model.zip"
+    download_file(server.url, destination)
+
+    _assert_downloaded(destination)
+    assert server.ranged_gets == 0
+    assert server.plain_gets == 1
+
+
+def test_download_falls_back_when_range_gets_full_body(server, tmp_path):
+    server.honour_ranges = False
+    destination = tmp_path / "vosk-model.zip"
+    download_file(server.url, destination)
+
+    _assert_downloaded(destination)
+    assert server.plain_gets == 1
+
+
+def test_download_rejects_truncated_range(server, tmp_path):
+    server.truncate_ranges = True
+    destination = tmp_path / "vosk-model.zip"
+
+    with pytest.raises(RuntimeError, match="expected"):
+        download_file(server.url, destination)
+
+    assert not destination.exists()
@@ -0,0 +1,52 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+
+from backend.pipeline import tts as tts_module
+
+SAMPLE_RATE = 16000
+
+
+class RacyTTS:
+    """Stands in for Coqui's ``TTS`` with the same shared per-call state.
+
+    Like pysbd's ``Segmenter.segment``, the text is stored on the instance and
+    read back later; an overlapping call makes the first one return nothing.
+    """
+
+    speakers = None
+
+    def __init__(self, *args, **kwargs) -> None:
+        self.synthesizer = SimpleNamespace(output_sample_rate=SAMPLE_RATE)
+        self._text = None
+
+    def tts(self, text, **kwargs):
+        self._text = text
+        time.sleep(0.05)
+        if self._text != text:
+            return []
+        return [0.1] * (SAMPLE_RATE // 10) * len(text)
+
+
+def test_stream_speech_keeps_every_sentence(monkeypatch):
+    monkeypatch.setattr(tts_module, "TTS", RacyTTS)
+    sentences = ["Hi there.", "How are you doing today?"]
+
+    async def collect(synthesizer):
+        chunks = []
+        async for chunk in synthesizer.stream_speech(" ".join(sentences)):
+            chunks.append(bytes(chunk))
+        return b"".join(chunks)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        synthesizer = tts_module.SpeechSynthesizer(
+            target_sample_rate=SAMPLE_RATE, executor=executor, use_gpu=False
+        )
+        audio = asyncio.run(collect(synthesizer))
+
+    samples = np.frombuffer(audio, dtype=np.int16)
+    expected = sum(SAMPLE_RATE // 10 * len(sentence) for sentence in sentences)
+    assert len(samples) == expected